@@ -1,7 +1,10 @@
 import json
+import random
 import threading
 import time
 import queue
+import traceback
+from collections import deque
 import bpy
 
 try:
@@ -9,6 +12,19 @@ try:
 except ModuleNotFoundError:
     from .vendor import websocket
 
+# Optional fast JSON encoder (not bundled with Blender) - falls back to stdlib.
+# orjson emits UTF-8 bytes directly; websocket-client sends them as a text frame.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+
+    def _dumps(obj):
+        return json.dumps(obj)
+
 # Protocol import
 try:
     from . import protocol
@@ -24,6 +40,10 @@ _old_module = sys.modules.get(__name__)
 
 _ws = None
 
+# True between on_open and the connection closing. A plain flag so event
+# handlers can bail out with one attribute load when nobody is listening.
+_connected = False
+
 # Preserve thread reference across reloads
 if _old_module and hasattr(_old_module, '_thread'):
     _thread = _old_module._thread
@@ -31,6 +51,12 @@ if _old_module and hasattr(_old_module, '_thread'):
 else:
     _thread = None
 
+# Sender thread (serializes and writes queued messages), preserved the same way
+if _old_module and hasattr(_old_module, '_sender_thread'):
+    _sender_thread = _old_module._sender_thread
+else:
+    _sender_thread = None
+
 # IMPORTANT: Preserve Event across module reloads to avoid thread desync
 # When module is reloaded, a new Event would be created but old thread
 # would still reference the old Event - causing communication breakdown
@@ -41,15 +67,32 @@ else:
     _should_run = threading.Event()
     print("[Blendmate] Created new _should_run Event")
 
+# Set to cut the reconnect wait short (on unregister, or to retry immediately).
+# Preserved across reloads for the same reason as _should_run.
+if _old_module and hasattr(_old_module, '_reconnect_wake'):
+    _reconnect_wake = _old_module._reconnect_wake
+else:
+    _reconnect_wake = threading.Event()
+
+# Reconnect backoff bounds in seconds (jittered by +-20% per attempt)
+_RECONNECT_BACKOFF_MIN = 0.25
+_RECONNECT_BACKOFF_MAX = 10.0
+
 _last_node_id = None
 
+# Outgoing messages held while the sender is behind; beyond this the oldest
+# are dropped so a long disconnect can't grow the backlog without bound
+_MAX_QUEUED = 4096
+_dropped_messages = 0
+_last_drop_report = 0.0
+
 # Also preserve queues across reloads to avoid losing messages
 if _old_module and hasattr(_old_module, '_message_queue'):
     _message_queue = _old_module._message_queue
     _pending_requests = _old_module._pending_requests
     print(f"[Blendmate] Reusing existing queues (msg={_message_queue.qsize()}, req={_pending_requests.qsize()})")
 else:
-    _message_queue = queue.Queue()
+    _message_queue = queue.Queue(maxsize=_MAX_QUEUED)
     _pending_requests = queue.Queue()  # Requests from Blendmate to process in main thread
     print("[Blendmate] Created new queues")
 
@@ -71,6 +114,75 @@ def is_protocol_v1():
 def info(msg):
     print(f"[Blendmate] {msg}")
 
+def _drop_backlog():
+    """Discard every queued message; returns how many were dropped."""
+    dropped = 0
+    while True:
+        try:
+            _message_queue.get_nowait()
+        except queue.Empty:
+            return dropped
+        _message_queue.task_done()
+        dropped += 1
+
+def _enqueue(msg):
+    """Queue a message for the sender thread, dropping the oldest when full."""
+    global _dropped_messages, _last_drop_report
+
+    while True:
+        try:
+            _message_queue.put_nowait(msg)
+            return
+        except queue.Full:
+            pass
+        try:
+            _message_queue.get_nowait()
+        except queue.Empty:
+            continue  # The sender just made room
+        _message_queue.task_done()
+        _dropped_messages += 1
+
+        # Report at most once per second
+        now = time.monotonic()
+        if now - _last_drop_report >= 1.0:
+            _last_drop_report = now
+            info(f"Send queue full: dropped {_dropped_messages} messages so far")
+
+# ============== Error Reporting ==============
+
+# Print full tracebacks for every error (off by default - tracebacks are
+# printed once per distinct error otherwise) and log every outgoing send
+_DEBUG = False
+
+# Last errors for post-mortem inspection: (time, context, formatted traceback).
+# Strings, not exception objects - those would keep every frame's locals alive.
+_recent_errors = deque(maxlen=16)
+# Occurrence count per distinct error (type name, message). Messages can carry
+# request data, so the table is bounded and reset on each new connection.
+_error_counts = {}
+_MAX_ERROR_KEYS = 256
+
+def log_exception(context):
+    """
+    Report the exception currently being handled.
+
+    The traceback is printed only for the first occurrence of a given error
+    (or always when _DEBUG is set); repeats just bump a counter so an error
+    storm from a misbehaving client can't flood stdout on the main thread.
+    """
+    exc = sys.exc_info()[1]
+    tb = traceback.format_exc()
+    _recent_errors.append((time.time(), context, tb))
+
+    key = (type(exc).__name__, str(exc))
+    count = _error_counts.get(key, 0) + 1
+    if count == 1 and len(_error_counts) >= _MAX_ERROR_KEYS:
+        _error_counts.clear()
+    _error_counts[key] = count
+
+    if _DEBUG or count == 1:
+        info(f"{context}:\n{tb}")
+
 def send_to_blendmate(data):
     """
     Adds a message to the queue to be sent by the timer.
@@ -84,11 +196,11 @@ def send_to_blendmate(data):
         # Protocol v1 mode - ensure envelope format
         if "v" in data and "body" in data:
             # Already an envelope - send as-is
-            _message_queue.put(data)
+            _enqueue(data)
         else:
             # Legacy message in v1 mode - wrap it (shouldn't happen often)
             envelope = protocol.wrap_legacy_message(data)
-            _message_queue.put(envelope)
+            _enqueue(envelope)
     else:
         # Legacy mode - send raw messages only
         # Strip any envelope wrapper if present
@@ -97,12 +209,12 @@ def send_to_blendmate(data):
             body = data.get("body", {})
             legacy = body.get("_legacy")
             if legacy:
-                _message_queue.put(legacy)
+                _enqueue(legacy)
             else:
                 # No legacy available, construct from body
-                _message_queue.put(body)
+                _enqueue(body)
         else:
-            _message_queue.put(data)
+            _enqueue(data)
 
 # ============== Scene Introspection ==============
 
@@ -298,7 +410,13 @@ def get_scene_data():
         "filepath": bpy.data.filepath or "(unsaved)",
     }
 
-def get_curves_geometry(obj):
+# Types that can be converted to mesh
+# CURVE = legacy Bezier/NURBS curves
+# CURVES = new hair curves system (Blender 3.3+)
+CONVERTIBLE_TYPES = frozenset({'MESH', 'CURVE', 'CURVES', 'SURFACE', 'FONT', 'META'})
+
+
+def get_curves_geometry(obj, depsgraph=None):
     """
     Get geometry data for CURVES objects (new hair curves system).
 
@@ -306,7 +424,8 @@ def get_curves_geometry(obj):
     the curve points and create edges connecting consecutive points.
     """
     try:
-        depsgraph = bpy.context.evaluated_depsgraph_get()
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
         eval_obj = obj.evaluated_get(depsgraph)
         curves_data = eval_obj.data
 
@@ -361,7 +480,7 @@ def get_curves_geometry(obj):
         return {"name": obj.name, "error": str(e)}
 
 
-def get_object_geometry(obj, decimate_ratio=None):
+def get_object_geometry(obj, depsgraph=None, decimate_ratio=None):
     """
     Get geometry data for an object that can be converted to mesh.
 
@@ -369,25 +488,22 @@ def get_object_geometry(obj, decimate_ratio=None):
 
     Args:
         obj: Blender object
+        depsgraph: Evaluated depsgraph to read from (fetched if None)
         decimate_ratio: Optional ratio (0.0-1.0) to simplify mesh
 
     Returns:
         Dict with vertices, edges and triangles, or None if conversion fails
     """
-    # Types that can be converted to mesh
-    # CURVE = legacy Bezier/NURBS curves
-    # CURVES = new hair curves system (Blender 3.3+)
-    CONVERTIBLE_TYPES = {'MESH', 'CURVE', 'CURVES', 'SURFACE', 'FONT', 'META'}
-
     if obj.type not in CONVERTIBLE_TYPES:
         return None
 
     # Special handling for CURVES (hair curves) - they don't convert to mesh well
     if obj.type == 'CURVES':
-        return get_curves_geometry(obj)
+        return get_curves_geometry(obj, depsgraph)
 
     try:
-        depsgraph = bpy.context.evaluated_depsgraph_get()
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
         eval_obj = obj.evaluated_get(depsgraph)
         eval_mesh = eval_obj.to_mesh()
 
@@ -464,36 +580,33 @@ def get_all_geometry(object_names=None, max_verts=50000):
     Returns:
         Dict mapping object names to geometry data
     """
-    # Types that can be converted to mesh
-    # CURVE = legacy Bezier/NURBS curves
-    # CURVES = new hair curves system (Blender 3.3+)
-    CONVERTIBLE_TYPES = {'MESH', 'CURVE', 'CURVES', 'SURFACE', 'FONT', 'META'}
-
     result = {}
 
+    # Single pass over bpy.data.objects: name -> convertible object
+    name_to_obj = {obj.name: obj for obj in bpy.data.objects if obj.type in CONVERTIBLE_TYPES}
+
     if object_names is None:
-        # Get all convertible objects
-        objects = [obj for obj in bpy.data.objects if obj.type in CONVERTIBLE_TYPES]
+        objects = list(name_to_obj.values())
     else:
-        objects = [bpy.data.objects.get(name) for name in object_names]
-        objects = [obj for obj in objects if obj is not None]
+        objects = [name_to_obj[name] for name in object_names if name in name_to_obj]
 
-    for obj in objects:
-        if obj.type not in CONVERTIBLE_TYPES:
-            continue
+    # Fetch the evaluated depsgraph once so all objects come from the same state
+    depsgraph = bpy.context.evaluated_depsgraph_get() if objects else None
 
+    for obj in objects:
         # Skip very large meshes (only for MESH type where we can check beforehand)
         if obj.type == 'MESH' and hasattr(obj.data, 'vertices'):
-            if len(obj.data.vertices) > max_verts:
+            vertex_count = len(obj.data.vertices)
+            if vertex_count > max_verts:
                 result[obj.name] = {
                     "name": obj.name,
                     "skipped": True,
-                    "reason": f"Too many vertices ({len(obj.data.vertices)} > {max_verts})",
-                    "vertex_count": len(obj.data.vertices),
+                    "reason": f"Too many vertices ({vertex_count} > {max_verts})",
+                    "vertex_count": vertex_count,
                 }
                 continue
 
-        geo = get_object_geometry(obj)
+        geo = get_object_geometry(obj, depsgraph)
         if geo:
             result[obj.name] = geo
 
@@ -537,8 +650,7 @@ try:
 except ImportError as e:
     _commands_available = False
     info(f"Commands module not available: {e}")
-    import traceback
-    traceback.print_exc()
+    log_exception("Commands import failed")
 
 
 def handle_request(request_data):
@@ -623,7 +735,7 @@ def handle_request(request_data):
             )
 
             # Queue the response
-            _message_queue.put(response)
+            _enqueue(response)
 
             # After upgrade, send v1 event.scene.connected as confirmation
             if _protocol_available and _session_protocol_version >= 1:
@@ -632,7 +744,7 @@ def handle_request(request_data):
                 filepath = bpy.data.filepath or "(unsaved)"
 
                 connected_event = protocol.create_event(
-                    "event.scene.connected",
+                    protocol.EVENT_SCENE_CONNECTED,
                     protocol.event_scene_connected(
                         blender_version=blender_version,
                         addon_version=addon_version,
@@ -640,7 +752,7 @@ def handle_request(request_data):
                     ),
                 )
                 # Don't include legacy fields in v1 mode
-                _message_queue.put(connected_event)
+                _enqueue(connected_event)
                 info("Sent v1 event.scene.connected as upgrade confirmation")
 
             # Return None to skip normal response sending (we already queued it)
@@ -724,8 +836,7 @@ def handle_request(request_data):
 
     except Exception as e:
         info(f"Error handling request: {e}")
-        import traceback
-        traceback.print_exc()
+        log_exception("handle_request")
         return make_response(
             error=str(e),
             error_code=protocol.ErrorCode.INTERNAL_ERROR if _protocol_available else None
@@ -762,8 +873,7 @@ def process_pending_requests():
             break
         except Exception as e:
             info(f"Error processing request: {e}")
-            import traceback
-            traceback.print_exc()
+            log_exception("process_pending_requests")
 
     return 0.1  # Check every 100ms
 
@@ -781,77 +891,138 @@ def on_ws_message(ws, message):
 
 # ============== Connection Check ==============
 
-def is_ws_connected():
-    """Check if WebSocket is connected."""
-    global _ws
+def is_connected():
+    """Check if a session is open, without touching the socket object."""
+    return _connected
+
+# ============== Heartbeat ==============
+
+_heartbeat_interval = 5.0  # seconds
+
+# Last legacy heartbeat as (key, pre-serialized JSON). Legacy heartbeats carry no
+# id/timestamp, so consecutive ones with the same context are byte-identical.
+_heartbeat_cache = (None, None)
+
+def _queue_heartbeat():
+    """Build a heartbeat and queue it."""
+    global _heartbeat_cache
+
+    # Get basic context info safely
+    active_obj = None
+    mode = None
     try:
-        if _ws and _ws.sock:
-            return True
+        if bpy.context.active_object:
+            active_obj = bpy.context.active_object.name
+            mode = bpy.context.active_object.mode
     except:
         pass
-    return False
 
-# ============== Heartbeat ==============
+    filepath = bpy.data.filepath or "(unsaved)"
 
-_heartbeat_interval = 5.0  # seconds
+    if is_protocol_v1() and _protocol_available:
+        # Native protocol format
+        heartbeat = protocol.create_heartbeat(active_obj, mode, filepath)
+        _enqueue(heartbeat)
+    else:
+        # Legacy format - re-encode only when the context changed
+        key = (active_obj, mode, filepath)
+        if _heartbeat_cache[0] != key:
+            _heartbeat_cache = (key, _dumps({
+                "type": "heartbeat",
+                "active_object": active_obj,
+                "mode": mode,
+                "filepath": filepath,
+            }))
+        _enqueue(_heartbeat_cache[1])
 
 def send_heartbeat():
     """Send periodic heartbeat with basic status."""
     if not _should_run.is_set():
         return None
 
-    if is_ws_connected():
+    if _connected:
         try:
-            # Get basic context info safely
-            active_obj = None
-            mode = None
-            try:
-                if bpy.context.active_object:
-                    active_obj = bpy.context.active_object.name
-                    mode = bpy.context.active_object.mode
-            except:
-                pass
-
-            filepath = bpy.data.filepath or "(unsaved)"
-
-            if is_protocol_v1() and _protocol_available:
-                # Native protocol format
-                heartbeat = protocol.create_heartbeat(active_obj, mode, filepath)
-                _message_queue.put(heartbeat)
-            else:
-                # Legacy format
-                send_to_blendmate({
-                    "type": "heartbeat",
-                    "active_object": active_obj,
-                    "mode": mode,
-                    "filepath": filepath,
-                })
+            _queue_heartbeat()
         except Exception as e:
             info(f"Heartbeat error: {e}")
 
+    # Fixed interval, connected or not - no fast polling while the app is away
     return _heartbeat_interval
 
-def process_queue():
-    """Timer callback to process the message queue and send via WebSocket."""
-    global _ws, _message_queue
+# ============== Sender Thread ==============
 
-    if not _should_run.is_set():
-        return None
+# Seconds the sender waits for a message (or a connection) before re-checking
+_SENDER_POLL = 0.25
+
+def _sender_loop():
+    """
+    Serialize and send queued messages off the Blender main thread.
+
+    Handlers and timers only put plain dicts (or pre-serialized heartbeats)
+    on _message_queue; JSON encoding and the socket write happen here, so a
+    burst of events never stalls the viewport. A failed send stops the
+    drain and waits for the next on_open, which discards what was queued
+    for the old session.
+    """
+    global _connected
 
-    if is_ws_connected() and not _message_queue.empty():
-        while not _message_queue.empty():
+    while _should_run.is_set():
+        # _connected is set in on_open, i.e. after the handshake - _ws.sock
+        # already exists while a connect attempt is still in progress
+        if not _connected:
+            time.sleep(_SENDER_POLL)
+            continue
+
+        try:
+            data = _message_queue.get(timeout=_SENDER_POLL)
+        except queue.Empty:
+            continue
+
+        # Send everything that is queued before blocking again
+        sent = 0
+        last_msg = None
+        while True:
             try:
-                data = _message_queue.get_nowait()
-                msg = json.dumps(data)
-                _ws.send(msg)
-                info(f"Sent: {msg[:100]}...")
+                # Pre-serialized messages (e.g. cached heartbeats) are sent as-is
+                msg = data if isinstance(data, (str, bytes)) else _dumps(data)
+            except Exception:
+                # Can't be encoded - retrying would fail the same way
+                log_exception("Encode error")
+                msg = None
+            finally:
                 _message_queue.task_done()
+
+            if msg is not None:
+                try:
+                    _ws.send(msg)
+                except Exception as e:
+                    # Closing the socket makes ws_thread reconnect
+                    info(f"Send error: {e}")
+                    _connected = False
+                    try:
+                        _ws.close()
+                    except Exception:
+                        pass
+                    break
+                sent += 1
+                last_msg = msg
+
+            try:
+                data = _message_queue.get_nowait()
             except queue.Empty:
                 break
-            except Exception as e:
-                info(f"Send error: {e}")
-                break
-    return 0.1
+
+        # Per-send logging runs for every flush during playback; debug only
+        if sent and _DEBUG:
+            preview = last_msg[:100]
+            if isinstance(preview, bytes):
+                preview = preview.decode("utf-8", "replace")
+            if sent == 1:
+                info(f"Sent: {preview}...")
+            else:
+                info(f"Sent {sent} messages, last: {preview}...")
+
+    info("Sender thread exiting (should_run is False)")
 
 def get_active_gn_node():
     """Returns the ID of the active node in the Geometry Nodes editor."""
@@ -874,9 +1045,12 @@ def get_active_gn_node():
 from . import preferences
 
 def ws_thread():
-    global _ws
+    global _ws, _connected
     info(f"WS Thread start sequence...")
 
+    # Reconnect delay: doubles per failed attempt, reset once a connection opens
+    backoff = _RECONNECT_BACKOFF_MIN
+
     while _should_run.is_set():
         try:
             # Get URL from preferences
@@ -886,8 +1060,25 @@ def ws_thread():
             info(f"Attempting connection to {url}...")
 
             def on_open(ws):
-                global _session_protocol_version
+                global _session_protocol_version, _connected
+                nonlocal backoff
                 info("WS Connected (on_open)")
+                backoff = _RECONNECT_BACKOFF_MIN
+
+                # Messages left from the previous session were built for its
+                # protocol mode; drop them before the sender resumes so the
+                # legacy hello below is the first thing the new session sees
+                dropped = _drop_backlog()
+                if dropped:
+                    info(f"Dropped {dropped} messages queued for the previous session")
+                _connected = True
+
+                # Each session reports its errors afresh
+                _error_counts.clear()
+
+                # The new session hasn't seen any frame yet
+                from . import handlers
+                handlers.reset_frame_dedup()
 
                 # Reset to legacy mode on new connection
                 _session_protocol_version = 0
@@ -900,7 +1091,7 @@ def ws_thread():
                 filepath = bpy.data.filepath or "(unsaved)"
 
                 # Always send legacy format on connect
-                _message_queue.put({
+                _enqueue({
                     "type": "event",
                     "event": "connected",
                     "blender_version": blender_version,
@@ -922,38 +1113,52 @@ def ws_thread():
             if _should_run.is_set():
                 info(f"Connection loop error: {e}")
 
+        _connected = False
+
         # Pokud máme stále běžet, počkáme před dalším pokusem
+        # (_reconnect_wake interrupts the wait, e.g. on unregister)
         if _should_run.is_set():
-            info("Connection lost. Waiting 2s before reconnect...")
-            _should_run.wait(timeout=2)
+            delay = backoff * random.uniform(0.8, 1.2)
+            info(f"Connection lost. Waiting {delay:.2f}s before reconnect...")
+            _reconnect_wake.wait(timeout=delay)
+            _reconnect_wake.clear()
+            backoff = min(_RECONNECT_BACKOFF_MAX, backoff * 2)
 
     info("WS Thread exiting (should_run is False)")
 
 def register():
-    global _thread
+    global _thread, _sender_thread
     info("Registering Connection module")
 
     # Timer registration is now handled by events.registry module
 
+    _should_run.set()  # Make sure it's enabled
+
+    # Start sender thread unless an old one survived a reload
+    if not (_sender_thread and _sender_thread.is_alive()):
+        _sender_thread = threading.Thread(target=_sender_loop, daemon=True)
+        _sender_thread.start()
+        info("Sender thread spawned")
+
     # Check if old thread is still running (can happen during reload)
     if _thread and _thread.is_alive():
         info("Old WS thread still running - reusing it")
-        _should_run.set()  # Make sure it's enabled
+        _reconnect_wake.set()  # Retry now if it is waiting to reconnect
         return
 
     # Start WS thread
-    _should_run.set()
     _thread = threading.Thread(target=ws_thread, daemon=True)
     _thread.start()
     info("WS Thread spawned")
 
 def unregister():
-    global _ws, _thread
+    global _ws, _thread, _sender_thread, _connected
     
     # Timer unregistration is now handled by events.registry module
 
-    # 2. Signal thread to stop
+    # 2. Signal thread to stop (and wake it if it is waiting to reconnect)
     _should_run.clear()
+    _reconnect_wake.set()
     
     # 3. Close websocket immediately
     if _ws:
@@ -962,9 +1167,13 @@ def unregister():
         except:
             pass
             
-    # 4. Wait for thread to exit (briefly)
+    # 4. Wait for threads to exit (briefly)
     if _thread and _thread.is_alive():
         _thread.join(timeout=0.5)
+    if _sender_thread and _sender_thread.is_alive():
+        _sender_thread.join(timeout=0.5)
     
     _thread = None
+    _sender_thread = None
     _ws = None
+    _connected = False
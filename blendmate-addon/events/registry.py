@@ -13,9 +13,10 @@ import bpy
 from .. import handlers
 from .. import connection
 
-# Storage for registered handlers to ensure clean removal
-_registered_handlers = []
-_registered_timers = []
+# Storage for registered handlers to ensure clean removal.
+# Keyed by id(func) so duplicate checks are O(1) instead of list scans.
+_registered_handlers = {}  # id(func) -> (handler_list, func)
+_registered_timers = {}  # id(func) -> func
 
 def register_all():
     """
@@ -47,6 +48,7 @@ def unregister_all():
     
     # Unregister app handlers
     _unregister_app_handlers()
+    handlers.reset_frame_dedup()
     
     # Future: clear msgbus subscriptions here
     
@@ -64,45 +66,60 @@ def _register_app_handlers():
     ]
     
     for handler_list, handler_func in handlers_to_register:
-        if handler_func not in handler_list:
+        _remove_stale_copies(handler_list, handler_func)
+        key = id(handler_func)
+        if key not in _registered_handlers and handler_func not in handler_list:
             handler_list.append(handler_func)
-            _registered_handlers.append((handler_list, handler_func))
+            _registered_handlers[key] = (handler_list, handler_func)
             connection.info(f"  Registered handler: {handler_func.__name__}")
 
+def _remove_stale_copies(handler_list, handler_func):
+    """
+    Remove handlers left behind by an earlier load of this addon.
+
+    After a reload the tracking dict starts empty, so an old function object
+    that was never unregistered would keep running next to the new one.
+    Copies are matched by module and name rather than identity.
+    """
+    name = handler_func.__name__
+    module = handler_func.__module__
+    for existing in [f for f in handler_list
+                     if f is not handler_func
+                     and getattr(f, "__name__", None) == name
+                     and getattr(f, "__module__", None) == module]:
+        handler_list.remove(existing)
+        connection.info(f"  Removed stale handler: {name}")
+
 def _unregister_app_handlers():
     """Unregister all tracked app.handlers callbacks."""
-    for handler_list, handler_func in _registered_handlers[:]:
-        if handler_func in handler_list:
-            try:
-                handler_list.remove(handler_func)
-                connection.info(f"  Unregistered handler: {handler_func.__name__}")
-            except ValueError:
-                # Already removed, not an error
-                pass
+    for handler_list, handler_func in _registered_handlers.values():
+        # Each (list, func) pair is touched once; remove() already scans
+        try:
+            handler_list.remove(handler_func)
+            connection.info(f"  Unregistered handler: {handler_func.__name__}")
+        except ValueError:
+            # Already removed, not an error
+            pass
 
 def _register_timers():
     """Register all timers."""
-    # Register the message queue processing timer (outgoing)
-    if not bpy.app.timers.is_registered(connection.process_queue):
-        bpy.app.timers.register(connection.process_queue, first_interval=0.1)
-        _registered_timers.append(connection.process_queue)
-        connection.info("  Registered timer: process_queue")
+    # Outgoing messages are sent by connection's sender thread, not a timer
 
     # Register the request processing timer (incoming)
     if not bpy.app.timers.is_registered(connection.process_pending_requests):
         bpy.app.timers.register(connection.process_pending_requests, first_interval=0.1)
-        _registered_timers.append(connection.process_pending_requests)
+        _registered_timers[id(connection.process_pending_requests)] = connection.process_pending_requests
         connection.info("  Registered timer: process_pending_requests")
 
     # Register heartbeat timer
     if not bpy.app.timers.is_registered(connection.send_heartbeat):
         bpy.app.timers.register(connection.send_heartbeat, first_interval=2.0)
-        _registered_timers.append(connection.send_heartbeat)
+        _registered_timers[id(connection.send_heartbeat)] = connection.send_heartbeat
         connection.info("  Registered timer: send_heartbeat")
 
 def _unregister_timers():
     """Unregister all tracked timers."""
-    for timer_func in _registered_timers[:]:
+    for timer_func in _registered_timers.values():
         if bpy.app.timers.is_registered(timer_func):
             try:
                 bpy.app.timers.unregister(timer_func)
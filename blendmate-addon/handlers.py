@@ -9,14 +9,58 @@ try:
 except ImportError:
     _protocol_available = False
 
+# Hot-path bindings resolved once at import instead of per handler call.
+# _enqueue never blocks: a full queue drops its oldest message instead.
+_queue_put = connection._enqueue
+_throttle_frame = throttle.throttle_frame
+_throttle_depsgraph = throttle.throttle_depsgraph
+if _protocol_available:
+    _create_event = protocol.create_event
+    _evt_node_active_changed = protocol.event_node_active_changed
+    _evt_file_saved = protocol.event_scene_file_saved
+    _evt_file_loaded = protocol.event_scene_file_loaded
+    _T_NODE_ACTIVE_CHANGED = protocol.EVENT_NODE_ACTIVE_CHANGED
+    _T_DEPSGRAPH_UPDATED = protocol.EVENT_DEPSGRAPH_UPDATED
+    _T_FRAME_CHANGED = protocol.EVENT_TIMELINE_FRAME_CHANGED
+    _T_FILE_SAVED = protocol.EVENT_SCENE_FILE_SAVED
+    _T_FILE_LOADED = protocol.EVENT_SCENE_FILE_LOADED
+
 
 def _use_v1():
     """Check if we should use protocol v1 format."""
     return connection.is_protocol_v1() and _protocol_available
 
 
+# Bound once - avoids the bpy.types attribute lookup per depsgraph update
+_ObjectType = bpy.types.Object
+
+# Last frame handed to the throttle. A manual frame jump fires
+# frame_change_post twice for the same frame; the repeat is dropped, but only
+# while not playing (playback over a one-frame range repeats the frame).
+_last_frame = None
+
+# Scratch sets for on_depsgraph_update, cleared on each call
+_scratch_changed = set()
+_scratch_geometry = set()
+
+
+def reset_frame_dedup():
+    """Forget the last frame, e.g. for a new connection or a loaded file."""
+    global _last_frame
+    _last_frame = None
+
+
+def _is_animation_playing():
+    screen = getattr(bpy.context, "screen", None)
+    return screen is not None and screen.is_animation_playing
+
+
 @bpy.app.handlers.persistent
 def on_depsgraph_update(scene, depsgraph):
+    # Nobody is listening - skip the node lookup and the updates scan entirely
+    if not connection._connected:
+        return
+
     # Optimization: Only check nodes if we have a connection
     # and only if something in the scene actually changed nodes-related
     current_node_id = connection.get_active_gn_node()
@@ -25,11 +69,10 @@ def on_depsgraph_update(scene, depsgraph):
         connection.info(f"Node Change: {current_node_id}")
 
         if _use_v1():
-            event = protocol.create_event(
-                "event.node.active_changed",
-                protocol.event_node_active_changed(current_node_id, "gn"),
-            )
-            connection._message_queue.put(event)
+            _queue_put(_create_event(
+                _T_NODE_ACTIVE_CHANGED,
+                _evt_node_active_changed(current_node_id, "gn"),
+            ))
         else:
             connection.send_to_blendmate({
                 "type": "context",
@@ -38,64 +81,52 @@ def on_depsgraph_update(scene, depsgraph):
             })
 
     # Extract changed objects from depsgraph
-    changed_objects = []
-    geometry_changed = []
+    # The same object can show up several times per update (transform + data),
+    # so names are collected in sets. The sets are reused across calls; the
+    # throttle copies the names into its own window.
+    changed = _scratch_changed
+    geometry = _scratch_geometry
+    changed.clear()
+    geometry.clear()
     for update in depsgraph.updates:
-        if update.id and hasattr(update.id, 'name'):
-            obj_name = update.id.name
-            # Check if it's an object (not scene, world, etc.)
-            if isinstance(update.id, bpy.types.Object):
-                changed_objects.append(obj_name)
-                # Check if geometry changed (not just transform)
-                if update.is_updated_geometry:
-                    geometry_changed.append(obj_name)
-
-    # Only send event if something actually changed
-    if changed_objects:
-        if _use_v1():
-            # Protocol v1 format (clean, no legacy fields)
-            body = protocol.event_depsgraph_updated(
-                changed_object_ids=changed_objects,
-                geometry_changed_ids=geometry_changed,
-                reason="user",
-            )
-            throttle.throttle_event(
-                "depsgraph_update",
-                body,
-                reason="depsgraph_changed",
-                new_type="event.depsgraph.updated",
-            )
-        else:
-            # Legacy format
-            throttle.throttle_event(
-                "depsgraph_update",
-                {
-                    "type": "event",
-                    "event": "depsgraph_update",
-                    "changed_objects": changed_objects,
-                    "geometry_changed": geometry_changed,
-                },
-                reason="depsgraph_changed"
-            )
+        update_id = update.id
+        # Check if it's an object (not scene, world, etc.). The exact-class test
+        # covers plain objects without going through RNA's isinstance check.
+        if update_id.__class__ is _ObjectType or isinstance(update_id, _ObjectType):
+            obj_name = update_id.name
+            changed.add(obj_name)
+            # Check if geometry changed (not just transform)
+            if update.is_updated_geometry:
+                geometry.add(obj_name)
+
+    # Only send event if something actually changed; the throttle merges the
+    # names into its pending window and builds the payload once on flush
+    if changed:
+        _throttle_depsgraph(
+            changed,
+            geometry,
+            new_type=_T_DEPSGRAPH_UPDATED if _use_v1() else None,
+        )
 
 
 @bpy.app.handlers.persistent
 def on_frame_change(scene, *args):
-    # Throttle frame change events to avoid high-frequency spam during playback
-    if _use_v1():
-        body = protocol.event_timeline_frame_changed(scene.frame_current)
-        throttle.throttle_event(
-            "frame_change",
-            body,
-            reason=f"frame_{scene.frame_current}",
-            new_type="event.timeline.frame_changed",
-        )
-    else:
-        throttle.throttle_event(
-            "frame_change",
-            {"type": "event", "event": "frame_change", "frame": scene.frame_current},
-            reason=f"frame_{scene.frame_current}"
-        )
+    global _last_frame
+
+    if not connection._connected:
+        return
+
+    frame = scene.frame_current
+    if frame == _last_frame and not _is_animation_playing():
+        return
+    _last_frame = frame
+
+    # Throttle frame change events to avoid high-frequency spam during playback.
+    # Only the frame number is recorded here; the payload is built on flush.
+    _throttle_frame(
+        frame,
+        new_type=_T_FRAME_CHANGED if _use_v1() else None,
+    )
 
 
 @bpy.app.handlers.persistent
@@ -104,11 +135,10 @@ def on_save_post(scene, *args):
     filepath = bpy.data.filepath or "(unsaved)"
 
     if _use_v1():
-        event = protocol.create_event(
-            "event.scene.file_saved",
-            protocol.event_scene_file_saved(filepath),
-        )
-        connection._message_queue.put(event)
+        _queue_put(_create_event(
+            _T_FILE_SAVED,
+            _evt_file_saved(filepath),
+        ))
     else:
         connection.send_to_blendmate({"type": "event", "event": "save_post", "filename": filepath})
 
@@ -116,20 +146,20 @@ def on_save_post(scene, *args):
 @bpy.app.handlers.persistent
 def on_load_post(scene, *args):
     connection.info("File Loaded")
+    reset_frame_dedup()
     filepath = bpy.data.filepath or "(unsaved)"
     blender_version = ".".join(str(v) for v in bpy.app.version[:3])
     addon_version = "1.0.0"
 
     if _use_v1():
-        event = protocol.create_event(
-            "event.scene.file_loaded",
-            protocol.event_scene_file_loaded(
+        _queue_put(_create_event(
+            _T_FILE_LOADED,
+            _evt_file_loaded(
                 filepath=filepath,
                 blender_version=blender_version,
                 addon_version=addon_version,
             ),
-        )
-        connection._message_queue.put(event)
+        ))
     else:
         connection.send_to_blendmate({"type": "event", "event": "load_post", "filename": filepath})
 
@@ -3,11 +3,15 @@ import bpy
 def extract_handlers():
     """Extracts all persistent handlers and their attributes for documentation."""
     handlers = {}
-    for attr in dir(bpy.app.handlers):
-        if not attr.startswith("_") and isinstance(getattr(bpy.app.handlers, attr), list):
+    app_handlers = bpy.app.handlers
+    for attr in dir(app_handlers):
+        if attr.startswith("_"):
+            continue
+        value = getattr(app_handlers, attr)
+        if isinstance(value, list):
             handlers[attr] = {
-                "count": len(getattr(bpy.app.handlers, attr)),
-                "description": getattr(bpy.app.handlers, attr).__doc__ if hasattr(getattr(bpy.app.handlers, attr), "__doc__") else ""
+                "count": len(value),
+                "description": getattr(value, "__doc__", ""),
             }
     return handlers
 
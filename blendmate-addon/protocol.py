@@ -10,10 +10,13 @@ Message Categories:
 - EVENT: Blender → Blendmate notifications (event.scene.*, event.selection.*, etc.)
 """
 
+import itertools
+import sys
 import time
 import uuid
 from typing import Any, Dict, List, Optional, Literal
 from enum import Enum
+from types import MappingProxyType
 
 
 # ============== Protocol Version ==============
@@ -45,36 +48,58 @@ class Source(str, Enum):
     AI = "ai"
 
 
+# Plain-string snapshots of hot enum values - read per envelope/response
+_SRC_ADDON = Source.BLENDER_ADDON.value
+_ERR_INTERNAL = ErrorCode.INTERNAL_ERROR.value
+
+
+# ============== Event Types ==============
+
+# Hierarchical event type strings. Dotted strings are not interned by
+# CPython automatically; interning them once lets type-keyed dict lookups
+# short-circuit on identity.
+EVENT_SCENE_CONNECTED = sys.intern("event.scene.connected")
+EVENT_SCENE_FILE_LOADED = sys.intern("event.scene.file_loaded")
+EVENT_SCENE_FILE_SAVED = sys.intern("event.scene.file_saved")
+EVENT_DEPSGRAPH_UPDATED = sys.intern("event.depsgraph.updated")
+EVENT_TIMELINE_FRAME_CHANGED = sys.intern("event.timeline.frame_changed")
+EVENT_NODE_ACTIVE_CHANGED = sys.intern("event.node.active_changed")
+EVENT_BATCH = sys.intern("event.batch")
+
+
 # ============== Event Type Mappings ==============
 
-# Maps old event names to new hierarchical type strings
-EVENT_TYPE_MAP = {
+# Maps old event names to new hierarchical type strings (read-only)
+EVENT_TYPE_MAP = MappingProxyType({
     # Scene events
-    "connected": "event.scene.connected",
-    "load_post": "event.scene.file_loaded",
-    "save_post": "event.scene.file_saved",
+    "connected": EVENT_SCENE_CONNECTED,
+    "load_post": EVENT_SCENE_FILE_LOADED,
+    "save_post": EVENT_SCENE_FILE_SAVED,
 
     # Depsgraph events
-    "depsgraph_update": "event.depsgraph.updated",
+    "depsgraph_update": EVENT_DEPSGRAPH_UPDATED,
 
     # Timeline events
-    "frame_change": "event.timeline.frame_changed",
+    "frame_change": EVENT_TIMELINE_FRAME_CHANGED,
 
     # Context events (GN node)
-    "context": "event.node.active_changed",
-}
-
-# Reverse map for legacy support
-LEGACY_EVENT_MAP = {v: k for k, v in EVENT_TYPE_MAP.items()}
+    "context": EVENT_NODE_ACTIVE_CHANGED,
+})
 
 
 # ============== Envelope Creation ==============
 
+# Message ids: a random per-process prefix plus a counter. Unique within a
+# session without reading os.urandom for every message.
+_ID_PREFIX = uuid.uuid4().hex[:4]
+_ID_SEQ = itertools.count()
+
+
 def create_envelope(
     msg_type: str,
     body: Dict[str, Any],
     reply_to: Optional[str] = None,
-    source: Source = Source.BLENDER_ADDON,
+    source: str = _SRC_ADDON,
 ) -> Dict[str, Any]:
     """
     Create a protocol envelope wrapping a message body.
@@ -83,7 +108,7 @@ def create_envelope(
         msg_type: Hierarchical type string (e.g., "event.selection.changed")
         body: The message payload
         reply_to: ID of the message this is responding to (for responses)
-        source: Origin of the message
+        source: Origin of the message (a Source value; Source members are str)
 
     Returns:
         Complete envelope dict ready for JSON serialization
@@ -91,9 +116,9 @@ def create_envelope(
     envelope = {
         "v": PROTOCOL_VERSION,
         "type": msg_type,
-        "ts": int(time.time() * 1000),  # Milliseconds since epoch
-        "id": str(uuid.uuid4())[:8],  # Short UUID for readability
-        "source": source.value,
+        "ts": time.time_ns() // 1_000_000,  # Milliseconds since epoch
+        "id": f"{_ID_PREFIX}{next(_ID_SEQ):04x}",  # Short id for readability
+        "source": source,
         "body": body,
     }
 
@@ -140,7 +165,7 @@ def create_response(
             body["data"] = data
     else:
         body["error"] = {
-            "code": (error_code or ErrorCode.INTERNAL_ERROR).value,
+            "code": error_code.value if error_code else _ERR_INTERNAL,
             "message": error_message or "Unknown error",
         }
         if error_data is not None:
@@ -185,6 +210,25 @@ def create_event(
     )
 
 
+def create_event_batch(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create an event.batch envelope carrying several event envelopes.
+
+    Used by the throttle to deliver everything flushed in one window as a
+    single message; receivers process body.events in order.
+
+    Args:
+        events: Complete event envelopes
+
+    Returns:
+        Batch envelope
+    """
+    return create_envelope(
+        msg_type=EVENT_BATCH,
+        body={"events": events, "batch_size": len(events)},
+    )
+
+
 # ============== Event Body Contracts ==============
 
 def event_selection_changed(
@@ -250,18 +294,22 @@ def event_depsgraph_updated(
     Emitted: When dependency graph updates (throttled)
     Cache impact: Invalidate geometry cache for changed objects
     """
-    body = {
+    if batch_id:
+        return {
+            "changed_object_ids": changed_object_ids,
+            "geometry_changed_ids": geometry_changed_ids,
+            "reason": reason,
+            "batch_id": batch_id,
+            "batch_size": batch_size or 1,
+        }
+
+    # Common case (batch info is added by the throttle): build in one literal
+    return {
         "changed_object_ids": changed_object_ids,
         "geometry_changed_ids": geometry_changed_ids,
         "reason": reason,
     }
 
-    if batch_id:
-        body["batch_id"] = batch_id
-        body["batch_size"] = batch_size or 1
-
-    return body
-
 
 def event_timeline_frame_changed(
     frame: int,
@@ -335,6 +383,64 @@ def create_heartbeat(
 
 # ============== Legacy Compatibility ==============
 
+def _wrap_legacy_event(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an old event to its new hierarchical type."""
+    old_event = legacy_msg.get("event", "unknown")
+    new_type = EVENT_TYPE_MAP.get(old_event, f"event.legacy.{old_event}")
+    body = legacy_msg.copy()
+    body.pop("type", None)
+    body.pop("event", None)
+    body["_legacy"] = legacy_msg
+    return create_envelope(new_type, body)
+
+
+def _wrap_legacy_response(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a response with the ok/error structure."""
+    request_id = legacy_msg.get("id", "unknown")
+    has_error = "error" in legacy_msg
+    body = {
+        "ok": not has_error,
+        "data": legacy_msg.get("data"),
+        "_legacy": legacy_msg,
+    }
+    if has_error:
+        body["error"] = {
+            "code": _ERR_INTERNAL,
+            "message": legacy_msg["error"],
+        }
+    return create_envelope("response", body, reply_to=request_id)
+
+
+def _wrap_legacy_heartbeat(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a heartbeat as a v1 heartbeat envelope."""
+    return create_heartbeat(
+        legacy_msg.get("active_object"),
+        legacy_msg.get("mode"),
+        legacy_msg.get("filepath", "(unsaved)"),
+    )
+
+
+def _wrap_legacy_context(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GN context message to event.node.active_changed."""
+    return create_event(
+        EVENT_NODE_ACTIVE_CHANGED,
+        event_node_active_changed(
+            legacy_msg.get("node_id", "unknown"),
+            legacy_msg.get("area"),
+        ),
+        legacy_type="context",
+    )
+
+
+# Legacy message "type" -> wrapper
+_LEGACY_WRAPPERS = {
+    "event": _wrap_legacy_event,
+    "response": _wrap_legacy_response,
+    "heartbeat": _wrap_legacy_heartbeat,
+    "context": _wrap_legacy_context,
+}
+
+
 def wrap_legacy_message(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
     """
     Wrap a legacy format message in the new envelope.
@@ -343,46 +449,9 @@ def wrap_legacy_message(legacy_msg: Dict[str, Any]) -> Dict[str, Any]:
     """
     msg_type = legacy_msg.get("type", "unknown")
 
-    # Map old event types to new
-    if msg_type == "event":
-        old_event = legacy_msg.get("event", "unknown")
-        new_type = EVENT_TYPE_MAP.get(old_event, f"event.legacy.{old_event}")
-        body = {k: v for k, v in legacy_msg.items() if k not in ("type", "event")}
-        body["_legacy"] = legacy_msg
-        return create_envelope(new_type, body)
-
-    elif msg_type == "response":
-        # Wrap response with ok/error structure
-        request_id = legacy_msg.get("id", "unknown")
-        has_error = "error" in legacy_msg
-        body = {
-            "ok": not has_error,
-            "data": legacy_msg.get("data"),
-            "_legacy": legacy_msg,
-        }
-        if has_error:
-            body["error"] = {
-                "code": ErrorCode.INTERNAL_ERROR.value,
-                "message": legacy_msg["error"],
-            }
-        return create_envelope("response", body, reply_to=request_id)
-
-    elif msg_type == "heartbeat":
-        return create_heartbeat(
-            legacy_msg.get("active_object"),
-            legacy_msg.get("mode"),
-            legacy_msg.get("filepath", "(unsaved)"),
-        )
-
-    elif msg_type == "context":
-        return create_event(
-            "event.node.active_changed",
-            event_node_active_changed(
-                legacy_msg.get("node_id", "unknown"),
-                legacy_msg.get("area"),
-            ),
-            legacy_type="context",
-        )
+    wrapper = _LEGACY_WRAPPERS.get(msg_type)
+    if wrapper is not None:
+        return wrapper(legacy_msg)
 
     # Unknown type - wrap as-is
     return create_envelope(f"legacy.{msg_type}", legacy_msg)
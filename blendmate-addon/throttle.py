@@ -5,15 +5,21 @@ Coalesces events within a 100ms window and flushes via bpy.app.timers.
 Supports protocol v1 envelope format with batch tracking.
 """
 
+import heapq
+import itertools
 import time
 import uuid
 import bpy
-from typing import Dict, Any, Set, Optional, List
+from typing import Dict, Any, Set, Optional, List, Tuple
 
 # Protocol import
 try:
     from . import protocol
     _protocol_available = True
+    # Bound once for the flush loops
+    _create_event = protocol.create_event
+    _create_event_batch = protocol.create_event_batch
+    _wrap_legacy_message = protocol.wrap_legacy_message
 except ImportError:
     _protocol_available = False
 
@@ -35,9 +41,63 @@ _dirty_reasons: Dict[str, Set[str]] = {}
 _coalesced_data: Dict[str, List[Any]] = {}  # For merging arrays across events
 _event_count: Dict[str, int] = {}  # Count of coalesced events per type
 _new_type_map: Dict[str, str] = {}  # Maps old event types to new protocol types
-_throttle_interval = 0.1  # Fixed 100ms
+_flush_heap: List[Tuple[int, str]] = []  # (deadline_ns, event_type), min-heap
+_throttle_interval = 0.1  # 100ms by default (see set_throttle_interval)
+_throttle_interval_ns = int(_throttle_interval * 1_000_000_000)
+_MAX_BATCH = 256  # Events per event.batch envelope
+_MAX_PENDING = 1024  # Pending event types before the oldest is evicted
+_dropped_events = 0
+_last_drop_report = 0.0
+
+# Batch ids: a counter seeded randomly once per load instead of a uuid4 per batch
+_batch_ids = itertools.count(uuid.uuid4().int & 0xFFFFFFFF)
 _send_function = None
 
+# Whether _flush_pending_events is currently registered as a timer
+_timer_armed = False
+_IDLE_TICKS = 4  # Empty flush windows before the timer stops
+_idle_ticks = 0
+
+# Frame changes keep only the latest frame number; the payload is built at flush
+_FRAME_EVENT = "frame_change"
+_latest_frame = 0
+
+# Depsgraph updates are merged into one pair of name sets whatever the
+# protocol mode; the builder places them in v1 or legacy fields at flush
+_DEPSGRAPH_EVENT = "depsgraph_update"
+_depsgraph_changed: Set[str] = set()
+_depsgraph_geometry: Set[str] = set()
+
+
+def set_throttle_interval(seconds: float):
+    """Set the debounce window (seconds)."""
+    global _throttle_interval, _throttle_interval_ns
+    _throttle_interval = seconds
+    _throttle_interval_ns = int(seconds * 1_000_000_000)
+
+
+def get_throttle_interval() -> float:
+    """Get the debounce window (seconds)."""
+    return _throttle_interval
+
+
+def _build_frame_event(new_type: Optional[str]) -> Dict[str, Any]:
+    """Build the frame_change payload for the latest reported frame."""
+    if new_type:
+        return protocol.event_timeline_frame_changed(_latest_frame)
+    return {"type": "event", "event": "frame_change", "frame": _latest_frame}
+
+
+def _build_depsgraph_event(new_type: Optional[str]) -> Dict[str, Any]:
+    """Build the depsgraph_update payload from the merged name sets and reset them."""
+    changed = list(_depsgraph_changed)
+    geometry_changed = list(_depsgraph_geometry)
+    _depsgraph_changed.clear()
+    _depsgraph_geometry.clear()
+    if new_type:
+        return protocol.event_depsgraph_updated(changed, geometry_changed, reason="user")
+    return {"type": "event", "event": "depsgraph_update", "changed_objects": changed, "geometry_changed": geometry_changed}
+
 
 def throttle_event(
     event_type: str,
@@ -50,12 +110,22 @@ def throttle_event(
 
     Args:
         event_type: Event type key for coalescing (e.g., "depsgraph_update")
-        event_data: Event payload
+        event_data: Event payload. Ownership passes to the throttle: the dict
+            is completed in place on flush, so callers must not reuse it.
         reason: Reason tag for debugging/audit
         new_type: New protocol type string (e.g., "event.depsgraph.updated")
     """
     global _pending_events, _dirty_reasons, _coalesced_data, _event_count, _new_type_map
 
+    # Identical payload already pending (e.g. repeated updates mid-drag):
+    # count it, but leave the data and the debounce deadline alone
+    pending = _pending_events.get(event_type)
+    if (pending is not None and pending["data"] == event_data
+            and (reason is None or reason in _dirty_reasons.get(event_type, ()))
+            and (new_type is None or _new_type_map.get(event_type) == new_type)):
+        _event_count[event_type] += 1
+        return
+
     # Track new type mapping
     if new_type:
         _new_type_map[event_type] = new_type
@@ -70,31 +140,165 @@ def throttle_event(
         }
         _event_count[event_type] = 0
 
-    # Merge arrays from new event into coalesced data
+    # Merge arrays from new event into coalesced data. Producers pass these
+    # fields as lists or sets; usually only one of the four is present.
     coalesced = _coalesced_data[event_type]
-    for field in ["changed_object_ids", "geometry_changed_ids", "changed_objects", "geometry_changed"]:
-        if field in event_data and isinstance(event_data[field], (list, set)):
-            coalesced[field].update(event_data[field])
+    ids = event_data.get("changed_object_ids")
+    if ids:
+        coalesced["changed_object_ids"].update(ids)
+    ids = event_data.get("geometry_changed_ids")
+    if ids:
+        coalesced["geometry_changed_ids"].update(ids)
+    ids = event_data.get("changed_objects")
+    if ids:
+        coalesced["changed_objects"].update(ids)
+    ids = event_data.get("geometry_changed")
+    if ids:
+        coalesced["geometry_changed"].update(ids)
 
     _event_count[event_type] += 1
 
-    # Store latest event data (will be enhanced with coalesced arrays on flush)
-    _pending_events[event_type] = {
-        "data": event_data,
-        "timestamp": time.time()
-    }
+    # Only a newly pending type needs a deadline and a (possibly stopped) timer;
+    # while it stays pending the flush timer is known to be running
+    deadline = time.monotonic_ns() + _throttle_interval_ns
+    is_new = event_type not in _pending_events
+    if is_new:
+        _add_pending(event_type, event_data, deadline)
+    else:
+        # Store latest event data (will be enhanced with coalesced arrays on flush)
+        _pending_events[event_type] = {
+            "data": event_data,
+            "deadline": deadline
+        }
 
     if reason:
-        if event_type not in _dirty_reasons:
-            _dirty_reasons[event_type] = set()
-        _dirty_reasons[event_type].add(reason)
+        reasons = _dirty_reasons.get(event_type)
+        if reasons is None:
+            _dirty_reasons[event_type] = {reason}
+        else:
+            reasons.add(reason)
+
+    if is_new:
+        _register_flush_timer()
+
+
+def throttle_frame(frame: int, new_type: Optional[str] = None):
+    """
+    Queue a frame change for throttled delivery.
+
+    Cheaper than throttle_event during playback: each call only stores the
+    frame number and refreshes the pending entry; the payload dict is built
+    once when the window flushes.
+
+    Args:
+        frame: Current frame number
+        new_type: New protocol type string (e.g., "event.timeline.frame_changed")
+    """
+    global _latest_frame
+
+    _latest_frame = frame
+    # The mode is decided per call so the flushed payload matches the
+    # latest call, even if the session was upgraded mid-window.
+    if new_type:
+        _new_type_map[_FRAME_EVENT] = new_type
+    else:
+        _new_type_map.pop(_FRAME_EVENT, None)
+
+    deadline = time.monotonic_ns() + _throttle_interval_ns
+    event_info = _pending_events.get(_FRAME_EVENT)
+    if event_info is not None:
+        event_info["deadline"] = deadline
+        _event_count[_FRAME_EVENT] += 1
+        return
+
+    _event_count[_FRAME_EVENT] = 1
+    _add_pending(_FRAME_EVENT, _build_frame_event, deadline)
+    _dirty_reasons[_FRAME_EVENT] = {"frame_change"}
 
     _register_flush_timer()
 
+
+def throttle_depsgraph(changed, geometry_changed, new_type: Optional[str] = None):
+    """
+    Queue a depsgraph update for throttled delivery.
+
+    The object names are unioned into the pending window's sets; no payload
+    is built per tick. The event is assembled once when the window flushes.
+
+    Args:
+        changed: Names of changed objects
+        geometry_changed: Names of objects whose geometry changed
+        new_type: New protocol type string (e.g., "event.depsgraph.updated")
+    """
+    _depsgraph_changed.update(changed)
+    _depsgraph_geometry.update(geometry_changed)
+    # As with frames, the latest call decides the protocol mode
+    if new_type:
+        _new_type_map[_DEPSGRAPH_EVENT] = new_type
+    else:
+        _new_type_map.pop(_DEPSGRAPH_EVENT, None)
+
+    deadline = time.monotonic_ns() + _throttle_interval_ns
+    event_info = _pending_events.get(_DEPSGRAPH_EVENT)
+    if event_info is not None:
+        event_info["deadline"] = deadline
+        _event_count[_DEPSGRAPH_EVENT] += 1
+        return
+
+    _event_count[_DEPSGRAPH_EVENT] = 1
+    _add_pending(_DEPSGRAPH_EVENT, _build_depsgraph_event, deadline)
+    _dirty_reasons.setdefault(_DEPSGRAPH_EVENT, set()).add("depsgraph_changed")
+
+    _register_flush_timer()
+
+
+def _add_pending(event_type: str, data: Any, deadline: int):
+    """Store a newly pending event type, evicting the oldest one if full."""
+    if len(_pending_events) >= _MAX_PENDING:
+        _evict_oldest()
+    heapq.heappush(_flush_heap, (deadline, event_type))
+    _pending_events[event_type] = {
+        "data": data,
+        "deadline": deadline
+    }
+
+
+def _evict_oldest():
+    """Drop the oldest pending event type (dicts keep insertion order)."""
+    global _dropped_events, _last_drop_report
+
+    oldest = next(iter(_pending_events))
+    del _pending_events[oldest]
+    _dirty_reasons.pop(oldest, None)
+    _coalesced_data.pop(oldest, None)
+    _event_count.pop(oldest, None)
+    _new_type_map.pop(oldest, None)
+    if oldest == _DEPSGRAPH_EVENT:
+        _depsgraph_changed.clear()
+        _depsgraph_geometry.clear()
+    _dropped_events += 1
+
+    # Report at most once per second
+    now = time.monotonic()
+    if now - _last_drop_report >= 1.0 and _connection_available:
+        _last_drop_report = now
+        _connection.info(f"Throttle full: dropped {_dropped_events} pending events so far")
+
+
+def _next_batch_id() -> str:
+    """Return a short batch id (8 hex digits)."""
+    return f"{next(_batch_ids) & 0xFFFFFFFF:08x}"
+
+
 def _register_flush_timer():
     """Register the flush timer if not already registered."""
-    if not bpy.app.timers.is_registered(_flush_pending_events):
-        bpy.app.timers.register(_flush_pending_events, first_interval=_throttle_interval)
+    global _timer_armed
+
+    # Tracked on the Python side so producers don't ask Blender on every call.
+    # Persistent, so loading a file doesn't drop the timer behind the flag.
+    if not _timer_armed:
+        bpy.app.timers.register(_flush_pending_events, first_interval=_throttle_interval, persistent=True)
+        _timer_armed = True
 
 def _flush_pending_events() -> Optional[float]:
     """
@@ -103,78 +307,133 @@ def _flush_pending_events() -> Optional[float]:
     Returns:
         float: Interval until next call, or None to stop timer
     """
-    global _pending_events, _dirty_reasons, _coalesced_data, _event_count, _new_type_map
+    global _pending_events, _dirty_reasons, _coalesced_data, _event_count, _new_type_map, _timer_armed, _idle_ticks
 
     if not _pending_events:
-        # No pending events, stop timer
+        # Nothing pending: keep ticking for a while, then stop the timer
+        return _idle_tick()
+    _idle_ticks = 0
+
+    if _send_function is None:
+        # Nowhere to send - don't build payloads just to discard them
+        _clear_state()
+        _timer_armed = False
         return None
 
-    current_time = time.time()
+    current_time = time.monotonic_ns()
+    use_v1 = _use_v1()
     events_to_send = []
-    next_flush_time = None
 
-    # Check which events are ready to flush
-    for event_type, event_info in list(_pending_events.items()):
-        time_since_event = current_time - event_info["timestamp"]
+    # Pop every entry whose heap deadline has passed. The heap entry is pushed
+    # when an event type first becomes pending; later calls only move the
+    # stored deadline, so an entry that turns out to be early is pushed back
+    # with its real deadline instead of being flushed.
+    while _flush_heap and _flush_heap[0][0] <= current_time:
+        _, event_type = heapq.heappop(_flush_heap)
+        event_info = _pending_events.get(event_type)
+        if event_info is None:
+            # Already flushed (flush_immediate / register)
+            continue
+
+        deadline = event_info["deadline"]
+        if deadline > current_time:
+            heapq.heappush(_flush_heap, (deadline, event_type))
+            continue
+
+        data = event_info["data"]
+        new_type = _new_type_map.pop(event_type, None)
+        # Lazily built payloads (frame changes) are produced at flush time,
+        # in the mode recorded with the entry. Stored dicts are owned by the
+        # throttle and dropped below, so they are completed in place rather
+        # than copied.
+        event_data = data(new_type) if callable(data) else data
+
+        # State for this event type is popped as it is read - one lookup each
+        del _pending_events[event_type]
 
-        # Flush if enough time has passed
-        if time_since_event >= _throttle_interval:
-            event_data = event_info["data"].copy()
-
-            # Replace arrays with coalesced data
-            if event_type in _coalesced_data:
-                coalesced = _coalesced_data[event_type]
-                for field in ["changed_object_ids", "geometry_changed_ids", "changed_objects", "geometry_changed"]:
-                    if coalesced[field]:
-                        event_data[field] = list(coalesced[field])
-
-            # Add batch info if multiple events were coalesced
-            batch_size = _event_count.get(event_type, 1)
-            if batch_size > 1:
-                event_data["batch_id"] = str(uuid.uuid4())[:8]
-                event_data["batch_size"] = batch_size
+        # Replace arrays with coalesced data
+        coalesced = _coalesced_data.pop(event_type, None)
+        if coalesced is not None:
+            _apply_coalesced(event_data, coalesced)
 
-            # Add dirty reasons if available
-            if event_type in _dirty_reasons and _dirty_reasons[event_type]:
-                event_data["reasons"] = list(_dirty_reasons[event_type])
+        # Add batch info if multiple events were coalesced
+        batch_size = _event_count.pop(event_type, 1)
+        if batch_size > 1:
+            event_data["batch_id"] = _next_batch_id()
+            event_data["batch_size"] = batch_size
 
-            # Wrap in protocol envelope if in v1 mode
-            new_type = _new_type_map.get(event_type)
-            if _use_v1() and new_type:
-                # Protocol v1: create clean envelope (no legacy fields)
-                envelope = protocol.create_event(new_type, event_data)
-                events_to_send.append(envelope)
-            else:
-                # Legacy mode: send raw event data
-                events_to_send.append(event_data)
+        # Add dirty reasons if available
+        reasons = _dirty_reasons.pop(event_type, None)
+        if reasons:
+            event_data["reasons"] = list(reasons)
 
-            # Clean up state for this event type
-            del _pending_events[event_type]
-            if event_type in _dirty_reasons:
-                del _dirty_reasons[event_type]
-            if event_type in _coalesced_data:
-                del _coalesced_data[event_type]
-            if event_type in _event_count:
-                del _event_count[event_type]
-            if event_type in _new_type_map:
-                del _new_type_map[event_type]
+        # Wrap in protocol envelope if the event was queued in v1 mode
+        if new_type:
+            # Protocol v1: create clean envelope (no legacy fields)
+            envelope = _create_event(new_type, event_data)
+            events_to_send.append(envelope)
         else:
-            # Calculate when this event should be flushed
-            time_until_flush = _throttle_interval - time_since_event
-            if next_flush_time is None or time_until_flush < next_flush_time:
-                next_flush_time = time_until_flush
+            # Legacy mode: send raw event data
+            events_to_send.append(event_data)
 
     # Send all ready events
     if events_to_send and _send_function:
-        for event_data in events_to_send:
-            _send_function(event_data)
+        _send_events(events_to_send, use_v1)
 
-    # Return calculated interval or stop timer if no pending events
-    if _pending_events and next_flush_time is not None:
-        # Return the time until the next event should be flushed
-        return max(0.01, next_flush_time)  # Minimum 10ms
+    # Sleep until the earliest deadline, or start idling if nothing is pending
+    if _pending_events and _flush_heap:
+        return max(0.01, (_flush_heap[0][0] - current_time) / 1_000_000_000)  # Minimum 10ms
     else:
-        return None
+        return _idle_tick()
+
+
+def _idle_tick() -> Optional[float]:
+    """
+    Account for one flush tick with nothing pending.
+
+    Bursty producers would otherwise stop and re-register the timer between
+    bursts, so it stays alive for _IDLE_TICKS empty windows first.
+    """
+    global _timer_armed, _idle_ticks
+
+    _idle_ticks += 1
+    if _idle_ticks <= _IDLE_TICKS:
+        return _throttle_interval
+    _timer_armed = False
+    return None
+
+def _apply_coalesced(event_data: Dict[str, Any], coalesced: Dict[str, set]):
+    """Replace the array fields of a flushed event with the merged names."""
+    ids = coalesced["changed_object_ids"]
+    if ids:
+        event_data["changed_object_ids"] = list(ids)
+    ids = coalesced["geometry_changed_ids"]
+    if ids:
+        event_data["geometry_changed_ids"] = list(ids)
+    ids = coalesced["changed_objects"]
+    if ids:
+        event_data["changed_objects"] = list(ids)
+    ids = coalesced["geometry_changed"]
+    if ids:
+        event_data["geometry_changed"] = list(ids)
+
+def _send_events(events: List[Dict[str, Any]], use_v1: bool):
+    """
+    Send flushed events in order.
+
+    In v1 mode several events go out as event.batch envelopes of at most
+    _MAX_BATCH events each; legacy clients get one message per event.
+    A batch carries envelopes only, so events queued before the v1 upgrade
+    are wrapped on the way in.
+    """
+    if len(events) > 1 and use_v1:
+        events = [event if "v" in event else _wrap_legacy_message(event) for event in events]
+        for start in range(0, len(events), _MAX_BATCH):
+            _send_function(_create_event_batch(events[start:start + _MAX_BATCH]))
+        return
+    for event_data in events:
+        _send_function(event_data)
+
 
 def flush_immediate():
     """Force immediate flush of all pending events."""
@@ -184,55 +443,67 @@ def flush_immediate():
         return
 
     if not _send_function:
+        _clear_state()
         return
 
-    for event_type, event_info in _pending_events.items():
-        event_data = event_info["data"].copy()
+    # Called from unregister(): a failing send must not leave state behind
+    try:
+        use_v1 = _use_v1()
+        events_to_send = []
+        for event_type, event_info in _pending_events.items():
+            data = event_info["data"]
+            new_type = _new_type_map.get(event_type)
+            event_data = data(new_type) if callable(data) else data
 
-        # Replace arrays with coalesced data
-        if event_type in _coalesced_data:
-            coalesced = _coalesced_data[event_type]
-            for field in ["changed_object_ids", "geometry_changed_ids", "changed_objects", "geometry_changed"]:
-                if coalesced[field]:
-                    event_data[field] = list(coalesced[field])
-
-        # Add batch info
-        batch_size = _event_count.get(event_type, 1)
-        if batch_size > 1:
-            event_data["batch_id"] = str(uuid.uuid4())[:8]
-            event_data["batch_size"] = batch_size
+            # Replace arrays with coalesced data
+            coalesced = _coalesced_data.get(event_type)
+            if coalesced is not None:
+                _apply_coalesced(event_data, coalesced)
 
-        # Add dirty reasons if available
-        if event_type in _dirty_reasons and _dirty_reasons[event_type]:
-            event_data["reasons"] = list(_dirty_reasons[event_type])
+            # Add batch info
+            batch_size = _event_count.get(event_type, 1)
+            if batch_size > 1:
+                event_data["batch_id"] = _next_batch_id()
+                event_data["batch_size"] = batch_size
 
-        # Wrap in protocol envelope if in v1 mode
-        new_type = _new_type_map.get(event_type)
-        if _use_v1() and new_type:
-            # Protocol v1: create clean envelope (no legacy fields)
-            envelope = protocol.create_event(new_type, event_data)
-            _send_function(envelope)
-        else:
-            # Legacy mode: send raw event data
-            _send_function(event_data)
+            # Add dirty reasons if available
+            if event_type in _dirty_reasons and _dirty_reasons[event_type]:
+                event_data["reasons"] = list(_dirty_reasons[event_type])
+
+            # Wrap in protocol envelope if the event was queued in v1 mode
+            if new_type:
+                # Protocol v1: create clean envelope (no legacy fields)
+                envelope = _create_event(new_type, event_data)
+                events_to_send.append(envelope)
+            else:
+                # Legacy mode: send raw event data
+                events_to_send.append(event_data)
+
+        _send_events(events_to_send, use_v1)
+    except Exception as e:
+        if _connection_available:
+            _connection.info(f"Throttle flush failed: {e}")
+    finally:
+        _clear_state()
 
-    # Clear all state
+
+def _clear_state():
+    """Drop all pending events and their per-type state."""
     _pending_events.clear()
+    _flush_heap.clear()
     _dirty_reasons.clear()
     _coalesced_data.clear()
     _event_count.clear()
     _new_type_map.clear()
+    _depsgraph_changed.clear()
+    _depsgraph_geometry.clear()
 
 
 def register():
     """Register the throttle system."""
     global _pending_events, _dirty_reasons, _coalesced_data, _event_count, _new_type_map, _send_function
 
-    _pending_events.clear()
-    _dirty_reasons.clear()
-    _coalesced_data.clear()
-    _event_count.clear()
-    _new_type_map.clear()
+    _clear_state()
 
     try:
         from . import connection
@@ -243,7 +514,10 @@ def register():
 
 def unregister():
     """Unregister the throttle system and flush pending events."""
+    global _timer_armed
+
     flush_immediate()
 
     if bpy.app.timers.is_registered(_flush_pending_events):
         bpy.app.timers.unregister(_flush_pending_events)
+    _timer_armed = False
@@ -1,6 +1,11 @@
 import bpy
 from .. import connection
 
+# Labels are fixed strings; draw() only picks one
+_VERSION_LABEL = "Version: 1.0.0"
+_CONNECTED_LABEL = "Status: Connected"
+_DISCONNECTED_LABEL = "Status: Disconnected"
+
 class BLENDMATE_PT_panel(bpy.types.Panel):
     bl_label = "Blendmate Dev"
     bl_idname = "BLENDMATE_PT_panel"
@@ -10,16 +15,10 @@ class BLENDMATE_PT_panel(bpy.types.Panel):
 
     def draw(self, context):
         layout = self.layout
-        layout.label(text=f"Version: 1.0.0")
-
-        status = "Disconnected"
-        try:
-            if connection._ws and hasattr(connection._ws, "sock") and connection._ws.sock and getattr(connection._ws.sock, "connected", False):
-                status = "Connected"
-        except Exception:
-            status = "Disconnected"
+        layout.label(text=_VERSION_LABEL)
 
-        layout.label(text=f"Status: {status}")
+        # draw() runs on every redraw; read the flag the WS thread maintains
+        layout.label(text=_CONNECTED_LABEL if connection.is_connected() else _DISCONNECTED_LABEL)
         # Removed Reload operator to prevent crashes
         layout.label(text="Use F3 > Reload Scripts for dev", icon='INFO')
 
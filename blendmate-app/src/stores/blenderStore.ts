@@ -507,6 +507,13 @@ export const useBlenderStore = create<BlenderState>()(
     },
 
     _processMessage: (msg) => {
+      // Batched events (throttle flush) - process each inner envelope in order
+      if (isEnvelope(msg) && msg.type === 'event.batch') {
+        const events = (msg.body as Record<string, unknown>).events as BlenderMessage[] | undefined;
+        events?.forEach((inner) => get()._processMessage(inner));
+        return;
+      }
+
       // Unwrap envelope if present
       const unwrapped = unwrapMessage(msg);
       const { type, body, replyTo, legacyEvent } = unwrapped;
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import json, time, shlex, subprocess
+import json, time, shutil, subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -7,20 +8,23 @@ INBOX = ROOT / "ops" / "inbox.json"
 OUTBOX = ROOT / "ops" / "outbox.jsonl"
 
 MAX_LOG_CHARS = 8000
+MAX_WORKERS = 8
+
+# Opened once by main(); line-buffered so each event still lands immediately
+_outbox = None
 
 
 def _log(event: dict):
     event["ts"] = int(time.time())
-    OUTBOX.parent.mkdir(parents=True, exist_ok=True)
-    with OUTBOX.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    _outbox.write(json.dumps(event, ensure_ascii=False) + "\n")
 
 
-def _run(cmd: str, cwd: Path | None = None, timeout: int | None = None) -> dict:
+def _run(cmd: list[str] | str, cwd: Path | None = None, timeout: int | None = None) -> dict:
+    # argv lists are exec'd directly; only free-form "cmd" strings go through a shell
     p = subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
-        shell=True,
+        shell=isinstance(cmd, str),
         capture_output=True,
         text=True,
         timeout=timeout,
@@ -35,86 +39,168 @@ def _run(cmd: str, cwd: Path | None = None, timeout: int | None = None) -> dict:
 
 def _require_tools():
     for tool in ("gh", "git", "python3"):
-        r = _run(f"command -v {shlex.quote(tool)}")
-        if not r["ok"]:
+        if shutil.which(tool) is None:
             raise SystemExit(f"Missing tool in PATH: {tool}")
 
 
+# --- GitHub (gh) actions ---
+
+def _h_gh_label_create(a: dict) -> dict:
+    name = a["name"]
+    color = a.get("color", "ededed")
+    desc = a.get("description", "")
+    cmd = ["gh", "label", "create", name, "--color", color, "--description", desc, "--force"]
+    return _run(cmd, cwd=ROOT)
+
+
+def _h_gh_issue_create(a: dict) -> dict:
+    title = a["title"]
+    body = a.get("body", "")
+    labels = a.get("labels", [])
+    label_arg = ",".join(labels)
+    cmd = ["gh", "issue", "create", "-t", title, "-b", body]
+    if label_arg:
+        cmd += ["-l", label_arg]
+    return _run(cmd, cwd=ROOT)
+
+
+def _h_gh_pr_list(a: dict) -> dict:
+    return _run(["gh", "pr", "list", "--limit", "50", "--json", "number,title,headRefName,baseRefName,state,url"], cwd=ROOT)
+
+
+def _h_gh_issue_list(a: dict) -> dict:
+    # optional filters: labels, state
+    state = a.get("state", "open")
+    labels = a.get("labels", [])
+    cmd = ["gh", "issue", "list", "--state", state]
+    for x in labels:
+        cmd += ["--label", x]
+    cmd += ["--limit", "200"]
+    return _run(cmd, cwd=ROOT)
+
+
+# --- git helpers ---
+
+def _h_git_status(a: dict) -> dict:
+    return _run(["git", "status", "--porcelain=v1"], cwd=ROOT)
+
+
+# --- generic command ---
+
+def _h_cmd(a: dict) -> dict:
+    command = a["command"]
+    cwd = ROOT / a.get("cwd", "")
+    timeout = int(a.get("timeout_sec", 300))
+    res = _run(command, cwd=cwd, timeout=timeout)
+    return {"cwd": str(cwd), **res}
+
+
+# Action type -> handler; each returns the fields logged with action_result
+_HANDLERS = {
+    "gh_label_create": _h_gh_label_create,
+    "gh_issue_create": _h_gh_issue_create,
+    "gh_pr_list": _h_gh_pr_list,
+    "gh_issue_list": _h_gh_issue_list,
+    "git_status": _h_git_status,
+    "cmd": _h_cmd,
+}
+
+# Read-only or idempotent actions that may run side by side. Issue creation
+# stays sequential so issue numbers follow plan order.
+_PARALLEL_SAFE = {"gh_label_create", "gh_pr_list", "gh_issue_list", "git_status"}
+
+
 def main():
+    global _outbox
+
     _require_tools()
 
     if not INBOX.exists() or INBOX.stat().st_size == 0:
         raise SystemExit("ops/inbox.json is missing or empty")
 
     plan = json.loads(INBOX.read_text(encoding="utf-8"))
+
+    OUTBOX.parent.mkdir(parents=True, exist_ok=True)
+    _outbox = OUTBOX.open("a", encoding="utf-8", buffering=1)
+    try:
+        _run_plan(plan)
+    finally:
+        _outbox.close()
+        _outbox = None
+
+
+def _run_plan(plan: dict):
     mode = plan.get("mode", "dry-run")
     repo = plan.get("repo", "")
     actions = plan.get("actions", [])
 
     _log({"type": "plan_start", "mode": mode, "repo": repo, "count": len(actions)})
 
+    # Contiguous parallel-safe actions are collected and run together
+    group = []
     for i, a in enumerate(actions):
-        t = a.get("type")
-        _log({"type": "action_start", "i": i, "action": a})
-
         if mode == "dry-run":
+            _log({"type": "action_start", "i": i, "action": a})
             _log({"type": "action_skip", "i": i, "reason": "dry-run"})
             continue
 
-        # --- GitHub (gh) actions ---
-        if t == "gh_label_create":
-            name = a["name"]
-            color = a.get("color", "ededed")
-            desc = a.get("description", "")
-            cmd = f'gh label create {shlex.quote(name)} --color {shlex.quote(color)} --description {shlex.quote(desc)} --force'
-            res = _run(cmd, cwd=ROOT)
-            _log({"type": "action_result", "i": i, "action_type": t, **res})
+        if a.get("type") in _PARALLEL_SAFE:
+            group.append((i, a))
             continue
 
-        if t == "gh_issue_create":
-            title = a["title"]
-            body = a.get("body", "")
-            labels = a.get("labels", [])
-            label_arg = ",".join(labels)
-            cmd = f'gh issue create -t {shlex.quote(title)} -b {shlex.quote(body)}'
-            if label_arg:
-                cmd += f' -l {shlex.quote(label_arg)}'
-            res = _run(cmd, cwd=ROOT)
-            _log({"type": "action_result", "i": i, "action_type": t, **res})
-            continue
+        _run_actions(group)
+        group = []
+        _run_actions([(i, a)])
 
-        if t == "gh_pr_list":
-            res = _run('gh pr list --limit 50 --json number,title,headRefName,baseRefName,state,url', cwd=ROOT)
-            _log({"type": "action_result", "i": i, "action_type": t, **res})
-            continue
+    _run_actions(group)
+    _log({"type": "plan_done"})
 
-        if t == "gh_issue_list":
-            # optional filters: labels, state
-            state = a.get("state", "open")
-            labels = a.get("labels", [])
-            label_flags = " ".join([f"--label {shlex.quote(x)}" for x in labels])
-            res = _run(f'gh issue list --state {shlex.quote(state)} {label_flags} --limit 200', cwd=ROOT)
-            _log({"type": "action_result", "i": i, "action_type": t, **res})
-            continue
 
-        # --- git helpers ---
-        if t == "git_status":
-            res = _run("git status --porcelain=v1", cwd=ROOT)
+def _run_actions(group: list[tuple[int, dict]]):
+    """Run (index, action) pairs, concurrently if more than one; logs stay in input order."""
+    if not group:
+        return
+
+    for i, a in group:
+        _log({"type": "action_start", "i": i, "action": a})
+
+    if len(group) == 1:
+        outcomes = [_dispatch_caught(group[0][1])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(group))) as pool:
+            outcomes = list(pool.map(_dispatch_caught, [a for _, a in group]))
+
+    # Only the main thread writes the outbox, so no lock is needed. Every
+    # action is logged before the first failure is re-raised.
+    first_error = None
+    for (i, a), (res, err) in zip(group, outcomes):
+        t = a.get("type")
+        if err is not None:
+            _log({"type": "action_error", "i": i, "error": f"{type(err).__name__}: {err}", "action": a})
+            if first_error is None:
+                first_error = err
+        elif res is None:
+            _log({"type": "action_error", "i": i, "error": f"Unknown action type: {t}", "action": a})
+        else:
             _log({"type": "action_result", "i": i, "action_type": t, **res})
-            continue
 
-        # --- generic command ---
-        if t == "cmd":
-            command = a["command"]
-            cwd = ROOT / a.get("cwd", "")
-            timeout = int(a.get("timeout_sec", 300))
-            res = _run(command, cwd=cwd, timeout=timeout)
-            _log({"type": "action_result", "i": i, "action_type": t, "cwd": str(cwd), **res})
-            continue
+    if first_error is not None:
+        raise first_error
 
-        _log({"type": "action_error", "i": i, "error": f"Unknown action type: {t}", "action": a})
 
-    _log({"type": "plan_done"})
+def _dispatch(a: dict) -> dict | None:
+    handler = _HANDLERS.get(a.get("type"))
+    if handler is None:
+        return None
+    return handler(a)
+
+
+def _dispatch_caught(a: dict) -> tuple[dict | None, Exception | None]:
+    # Failures are returned, not raised, so one action can't hide the others' results
+    try:
+        return _dispatch(a), None
+    except Exception as e:
+        return None, e
 
 
 if __name__ == "__main__":
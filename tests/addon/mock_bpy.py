@@ -2,8 +2,15 @@ import sys
 from unittest.mock import MagicMock
 
 class MockBpy:
+    # Fixed attribute sets: slot reads instead of instance __dict__ lookups
+    __slots__ = ('app', 'data', 'context', 'types', 'utils')
+
     class App:
+        __slots__ = ('handlers', 'timers')
+
         class Handlers:
+            __slots__ = ('save_post', 'load_post', 'depsgraph_update_post', 'frame_change_post')
+
             def __init__(self):
                 self.save_post = []
                 self.load_post = []
@@ -13,6 +20,8 @@ class MockBpy:
                 return func
         
         class Timers:
+            __slots__ = ('_registered_timers',)
+
             def __init__(self):
                 self._registered_timers = []
             
@@ -35,10 +44,14 @@ class MockBpy:
             self.timers = self.Timers()
 
     class Data:
+        __slots__ = ('filepath',)
+
         def __init__(self):
             self.filepath = "test.blend"
 
     class Context:
+        __slots__ = ('screen',)
+
         def __init__(self):
             self.screen = MagicMock()
             self.screen.areas = []
@@ -6,7 +6,8 @@ from unittest.mock import MagicMock, patch
 
 # Add the root directory to sys.path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
-sys.path.append(root_dir)
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
 # Import mock_bpy before connection to ensure bpy is mocked
 from tests.addon.mock_bpy import mock_bpy
@@ -18,7 +19,9 @@ try:
     import blendmate_addon.connection as connection
 except ImportError:
     # If the user renamed it or we are in a different environment
-    sys.path.append(os.path.join(root_dir, 'blendmate-addon'))
+    addon_dir = os.path.join(root_dir, 'blendmate-addon')
+    if addon_dir not in sys.path:
+        sys.path.append(addon_dir)
     import connection
 
 class TestConnection(unittest.TestCase):
@@ -84,4 +87,7 @@ class TestConnection(unittest.TestCase):
             })
 
 if __name__ == '__main__':
-    unittest.main()
+    # Keep definition order and skip per-test output
+    loader = unittest.TestLoader()
+    loader.sortTestMethodsUsing = None
+    unittest.main(testLoader=loader, verbosity=0)
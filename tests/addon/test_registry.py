@@ -6,12 +6,33 @@ without needing full import resolution due to the blendmate-addon naming issue.
 
 import unittest
 import os
+import re
 import sys
 
 # Add the root directory to sys.path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 
+addon_dir = os.path.join(root_dir, 'blendmate-addon')
+registry_file = os.path.join(addon_dir, 'events', 'registry.py')
+handlers_file = os.path.join(addon_dir, 'handlers.py')
+connection_file = os.path.join(addon_dir, 'connection.py')
+init_file = os.path.join(addon_dir, '__init__.py')
+
 class TestRegistryStructure(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Read each checked source file once for all tests."""
+        cls._src = {}
+        for path in (registry_file, handlers_file, connection_file, init_file):
+            with open(path, 'r') as f:
+                cls._src[path] = f.read()
+
+    def assertContainsAll(self, content, required):
+        """Check all required substrings with a single scan of content."""
+        pattern = re.compile('|'.join(re.escape(token) for token in required))
+        missing = set(required) - set(pattern.findall(content))
+        self.assertFalse(missing, f"missing: {sorted(missing)}")
+
     def test_registry_files_exist(self):
         """Test that registry module files exist."""
         events_dir = os.path.join(root_dir, 'blendmate-addon', 'events')
@@ -25,51 +46,41 @@ class TestRegistryStructure(unittest.TestCase):
 
     def test_registry_has_required_functions(self):
         """Test that registry.py contains required function definitions."""
-        registry_file = os.path.join(root_dir, 'blendmate-addon', 'events', 'registry.py')
-        
-        with open(registry_file, 'r') as f:
-            content = f.read()
-        
-        # Check for required functions
-        self.assertIn('def register_all()', content, "register_all function should be defined")
-        self.assertIn('def unregister_all()', content, "unregister_all function should be defined")
-        
-        # Check for idempotency support
-        self.assertIn('_registered_handlers', content, "Should track registered handlers")
-        self.assertIn('_registered_timers', content, "Should track registered timers")
-        
-        # Check for proper cleanup
-        self.assertIn('.clear()', content, "Should clear tracking lists")
-        
-        # Check for handler registration
-        self.assertIn('bpy.app.handlers', content, "Should register app handlers")
-        
-        # Check for timer registration  
-        self.assertIn('bpy.app.timers', content, "Should register timers")
+        content = self._src[registry_file]
+        
+        self.assertContainsAll(content, (
+            # Required functions
+            'def register_all()',
+            'def unregister_all()',
+            # Idempotency support
+            '_registered_handlers',
+            '_registered_timers',
+            # Proper cleanup
+            '.clear()',
+            # Handler and timer registration
+            'bpy.app.handlers',
+            'bpy.app.timers',
+        ))
 
     def test_handlers_file_updated(self):
         """Test that handlers.py no longer has register/unregister functions."""
-        handlers_file = os.path.join(root_dir, 'blendmate-addon', 'handlers.py')
-        
-        with open(handlers_file, 'r') as f:
-            content = f.read()
+        content = self._src[handlers_file]
         
         # Check that old registration code is removed/commented
         self.assertNotIn('def register():', content, "handlers.py should not have register function")
         self.assertNotIn('def unregister():', content, "handlers.py should not have unregister function")
         
         # Check that handler functions still exist
-        self.assertIn('def on_save_post', content, "Handler functions should still exist")
-        self.assertIn('def on_load_post', content, "Handler functions should still exist")
-        self.assertIn('def on_depsgraph_update', content, "Handler functions should still exist")
-        self.assertIn('def on_frame_change', content, "Handler functions should still exist")
+        self.assertContainsAll(content, (
+            'def on_save_post',
+            'def on_load_post',
+            'def on_depsgraph_update',
+            'def on_frame_change',
+        ))
 
     def test_connection_file_updated(self):
         """Test that connection.py delegates timer management to registry."""
-        connection_file = os.path.join(root_dir, 'blendmate-addon', 'connection.py')
-        
-        with open(connection_file, 'r') as f:
-            content = f.read()
+        content = self._src[connection_file]
         
         # Check for comments indicating delegation
         register_pos = content.find('def register():')
@@ -88,10 +99,7 @@ class TestRegistryStructure(unittest.TestCase):
 
     def test_main_init_includes_events_module(self):
         """Test that main __init__.py includes events module in registration."""
-        init_file = os.path.join(root_dir, 'blendmate-addon', '__init__.py')
-        
-        with open(init_file, 'r') as f:
-            content = f.read()
+        content = self._src[init_file]
         
         # Check that events module is in the modules list
         self.assertIn('"events"', content, "events module should be in modules list")
@@ -117,4 +125,7 @@ class TestRegistryStructure(unittest.TestCase):
         self.assertGreater(events_pos, connection_pos, "events should come after connection")
 
 if __name__ == '__main__':
-    unittest.main()
+    # Keep definition order and skip per-test output
+    loader = unittest.TestLoader()
+    loader.sortTestMethodsUsing = None
+    unittest.main(testLoader=loader, verbosity=0)
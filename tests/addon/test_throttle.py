@@ -6,7 +6,8 @@ from unittest.mock import MagicMock, patch, call
 
 # Add the root directory to sys.path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
-sys.path.append(root_dir)
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
 # Import mock_bpy before throttle to ensure bpy is mocked
 from tests.addon.mock_bpy import mock_bpy
@@ -15,8 +16,11 @@ from tests.addon.mock_bpy import mock_bpy
 sys.modules['blendmate-addon.connection'] = MagicMock()
 
 # Now we can safely import throttle
-sys.path.append(os.path.join(root_dir, 'blendmate-addon'))
+addon_dir = os.path.join(root_dir, 'blendmate-addon')
+if addon_dir not in sys.path:
+    sys.path.append(addon_dir)
 import throttle
+import protocol
 
 class TestThrottle(unittest.TestCase):
     def setUp(self):
@@ -33,6 +37,7 @@ class TestThrottle(unittest.TestCase):
         """Clean up after each test."""
         if mock_bpy.app.timers.is_registered(throttle._flush_pending_events):
             mock_bpy.app.timers.unregister(throttle._flush_pending_events)
+        throttle._timer_armed = False
         throttle._pending_events.clear()
         throttle._dirty_reasons.clear()
         throttle._send_function = None
@@ -72,6 +77,37 @@ class TestThrottle(unittest.TestCase):
         self.assertIn("reason1", throttle._dirty_reasons["test"])
         self.assertIn("reason2", throttle._dirty_reasons["test"])
 
+    def test_identical_event_does_not_refresh_deadline(self):
+        """Test that a duplicate pending payload only bumps the batch count."""
+        event_data = {"type": "event", "event": "test", "value": 1}
+
+        throttle.throttle_event("test", event_data, reason="r1")
+        deadline = throttle._pending_events["test"]["deadline"]
+        throttle.throttle_event("test", dict(event_data), reason="r1")
+
+        self.assertEqual(throttle._pending_events["test"]["deadline"], deadline)
+
+        throttle.flush_immediate()
+        self.assertEqual(self.mock_send.call_args[0][0]["batch_size"], 2)
+
+    def test_pending_events_are_bounded(self):
+        """Test that the oldest pending type is evicted once the limit is hit."""
+        with patch.object(throttle, "_MAX_PENDING", 2):
+            throttle.throttle_event("a", {"value": 1})
+            throttle.throttle_event("b", {"value": 2})
+            throttle.throttle_event("c", {"value": 3})
+
+        self.assertEqual(list(throttle._pending_events), ["b", "c"])
+
+    def test_frame_and_depsgraph_respect_pending_bound(self):
+        """Test that the frame and depsgraph producers also evict the oldest type."""
+        with patch.object(throttle, "_MAX_PENDING", 2):
+            throttle.throttle_event("a", {"value": 1})
+            throttle.throttle_frame(1)
+            throttle.throttle_depsgraph(["Cube"], [])
+
+        self.assertEqual(list(throttle._pending_events), ["frame_change", "depsgraph_update"])
+
     def test_flush_immediate_sends_all_events(self):
         """Test that flush_immediate sends all pending events immediately."""
         event_data_1 = {"type": "event", "event": "test1"}
@@ -116,7 +152,28 @@ class TestThrottle(unittest.TestCase):
         time.sleep(0.11)
         result = throttle._flush_pending_events()
         self.mock_send.assert_called_once()
-        self.assertIsNone(result)  # Timer should stop (no more events)
+        self.assertEqual(result, throttle._throttle_interval)  # Timer idles
+
+        # With nothing pending the timer stops after a few idle ticks
+        for _ in range(throttle._IDLE_TICKS - 1):
+            self.assertIsNotNone(throttle._flush_pending_events())
+        self.assertIsNone(throttle._flush_pending_events())
+
+    def test_flush_waits_for_refreshed_event(self):
+        """Test that refreshing a pending event pushes its flush back."""
+        throttle.throttle_event("test", {"type": "event", "value": 1})
+        time.sleep(0.06)
+        throttle.throttle_event("test", {"type": "event", "value": 2})
+        time.sleep(0.06)
+
+        # First deadline has passed, but the refresh moved the real one
+        result = throttle._flush_pending_events()
+        self.mock_send.assert_not_called()
+        self.assertIsNotNone(result)
+
+        time.sleep(0.05)
+        throttle._flush_pending_events()
+        self.mock_send.assert_called_once()
 
     def test_register_unregister(self):
         """Test register and unregister clear state."""
@@ -145,5 +202,114 @@ class TestThrottle(unittest.TestCase):
         throttle.flush_immediate()
         self.assertEqual(self.mock_send.call_count, 2)
 
+    def test_throttle_frame_sends_latest_frame(self):
+        """Test that throttle_frame coalesces playback into the latest frame."""
+        for frame in range(1, 11):
+            throttle.throttle_frame(frame)
+
+        self.assertEqual(len(throttle._pending_events), 1)
+
+        throttle.flush_immediate()
+
+        self.mock_send.assert_called_once()
+        sent_data = self.mock_send.call_args[0][0]
+        self.assertEqual(sent_data["event"], "frame_change")
+        self.assertEqual(sent_data["frame"], 10)
+        self.assertEqual(sent_data["batch_size"], 10)
+
+    def test_throttle_frame_uses_mode_of_latest_call(self):
+        """Test that a v1 call after a legacy one in the same window flushes an envelope."""
+        throttle.throttle_frame(1)
+        throttle.throttle_frame(2, new_type="event.timeline.frame_changed")
+
+        with patch.object(throttle, "protocol", protocol, create=True), \
+                patch.object(throttle, "_create_event", protocol.create_event, create=True):
+            throttle.flush_immediate()
+
+        sent_data = self.mock_send.call_args[0][0]
+        self.assertEqual(sent_data["type"], "event.timeline.frame_changed")
+        self.assertEqual(sent_data["body"]["frame"], 2)
+        self.assertNotIn("event", sent_data["body"])
+
+    def test_throttle_depsgraph_merges_object_names(self):
+        """Test that throttle_depsgraph unions names across ticks into one event."""
+        throttle.throttle_depsgraph({"Cube", "Sphere"}, {"Cube"})
+        throttle.throttle_depsgraph({"Cube", "Light"}, set())
+
+        self.assertEqual(len(throttle._pending_events), 1)
+
+        throttle.flush_immediate()
+
+        self.mock_send.assert_called_once()
+        sent_data = self.mock_send.call_args[0][0]
+        self.assertEqual(sent_data["event"], "depsgraph_update")
+        self.assertEqual(sorted(sent_data["changed_objects"]), ["Cube", "Light", "Sphere"])
+        self.assertEqual(sent_data["geometry_changed"], ["Cube"])
+        self.assertEqual(sent_data["batch_size"], 2)
+        self.assertIn("depsgraph_changed", sent_data["reasons"])
+
+    def test_throttle_depsgraph_keeps_legacy_names_after_upgrade(self):
+        """Test that names throttled in v0 are sent when the window flushes in v1."""
+        throttle.throttle_depsgraph(["Cube"], ["Cube"])
+        throttle.throttle_depsgraph(["Light"], [], new_type="event.depsgraph.updated")
+
+        with patch.object(throttle, "protocol", protocol, create=True), \
+                patch.object(throttle, "_create_event", protocol.create_event, create=True):
+            throttle.flush_immediate()
+
+        sent_data = self.mock_send.call_args[0][0]
+        self.assertEqual(sent_data["type"], "event.depsgraph.updated")
+        self.assertEqual(sorted(sent_data["body"]["changed_object_ids"]), ["Cube", "Light"])
+        self.assertEqual(sent_data["body"]["geometry_changed_ids"], ["Cube"])
+        self.assertNotIn("changed_objects", sent_data["body"])
+
+    def test_flush_batches_events_in_v1_mode(self):
+        """Test that v1 mode sends one event.batch envelope per flush."""
+        throttle.throttle_event("test1", {"value": 1}, new_type="event.test.one")
+        throttle.throttle_event("test2", {"value": 2}, new_type="event.test.two")
+
+        with patch.object(throttle, "_use_v1", return_value=True), \
+                patch.object(throttle, "_create_event", protocol.create_event, create=True), \
+                patch.object(throttle, "_create_event_batch", protocol.create_event_batch, create=True):
+            throttle.flush_immediate()
+
+        self.mock_send.assert_called_once()
+        sent_data = self.mock_send.call_args[0][0]
+        self.assertEqual(sent_data["type"], "event.batch")
+        self.assertEqual(sent_data["body"]["batch_size"], 2)
+        self.assertEqual(
+            [event["type"] for event in sent_data["body"]["events"]],
+            ["event.test.one", "event.test.two"],
+        )
+
+    def test_flush_batch_wraps_legacy_events(self):
+        """Test that events queued before the v1 upgrade enter the batch as envelopes."""
+        throttle.throttle_event("test1", {"type": "event", "event": "test1"})
+        throttle.throttle_event("test2", {"value": 2}, new_type="event.test.two")
+
+        with patch.object(throttle, "_use_v1", return_value=True), \
+                patch.object(throttle, "_create_event", protocol.create_event, create=True), \
+                patch.object(throttle, "_create_event_batch", protocol.create_event_batch, create=True), \
+                patch.object(throttle, "_wrap_legacy_message", protocol.wrap_legacy_message, create=True):
+            throttle.flush_immediate()
+
+        events = self.mock_send.call_args[0][0]["body"]["events"]
+        self.assertEqual(len(events), 2)
+        for event in events:
+            self.assertEqual(event["v"], protocol.PROTOCOL_VERSION)
+
+    def test_flush_immediate_clears_state_when_send_fails(self):
+        """Test that a failing send does not leave pending state behind."""
+        self.mock_send.side_effect = RuntimeError("socket closed")
+        throttle.throttle_event("test", {"type": "event", "event": "test"}, reason="r1")
+
+        throttle.flush_immediate()
+
+        self.assertEqual(len(throttle._pending_events), 0)
+        self.assertEqual(len(throttle._dirty_reasons), 0)
+
 if __name__ == '__main__':
-    unittest.main()
+    # Keep definition order and skip per-test output
+    loader = unittest.TestLoader()
+    loader.sortTestMethodsUsing = None
+    unittest.main(testLoader=loader, verbosity=0)
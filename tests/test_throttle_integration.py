@@ -12,7 +12,8 @@ from unittest.mock import MagicMock
 
 # Add the root directory to sys.path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.append(root_dir)
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
 # Import mock_bpy before any addon modules
 from tests.addon.mock_bpy import mock_bpy
@@ -21,7 +22,9 @@ from tests.addon.mock_bpy import mock_bpy
 sys.modules['blendmate-addon.connection'] = MagicMock()
 
 # Now we can import throttle
-sys.path.append(os.path.join(root_dir, 'blendmate-addon'))
+addon_dir = os.path.join(root_dir, 'blendmate-addon')
+if addon_dir not in sys.path:
+    sys.path.append(addon_dir)
 import throttle
 
 def test_throttle_integration():
@@ -1,26 +1,66 @@
+import argparse
 import asyncio
 import websockets
 import json
 import sys
 
+# Optional fast JSON codec - falls back to stdlib.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except covers both.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _format(data):
+        if PRETTY:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        return orjson.dumps(data).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _format(data):
+        if PRETTY:
+            return json.dumps(data, indent=2)
+        return json.dumps(data, separators=(",", ":"))
+
 # Konfigurace
 ADDR = "127.0.0.1"
 PORT = 32123
+PRETTY = False  # Indented output (--pretty); compact single lines otherwise
+
+# Received frames waiting to be printed; the oldest is dropped when full
+QUEUE_SIZE = 1024
+
+async def _printer(remote_addr, queue):
+    while True:
+        message = await queue.get()
+        try:
+            data = _loads(message)
+            print(f"[{remote_addr}] Received JSON: {_format(data)}")
+        except json.JSONDecodeError:
+            print(f"[{remote_addr}] Received Raw: {message}")
+        finally:
+            queue.task_done()
 
 async def handle_client(websocket):
     remote_addr = websocket.remote_address
     print(f"--- Client connected from {remote_addr} ---")
+    # Printing happens in a separate task so stdout never stalls the WS reads
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    printer = asyncio.create_task(_printer(remote_addr, queue))
     try:
         async for message in websocket:
-            try:
-                data = json.loads(message)
-                print(f"[{remote_addr}] Received JSON: {json.dumps(data, indent=2)}")
-            except json.JSONDecodeError:
-                print(f"[{remote_addr}] Received Raw: {message}")
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+            queue.put_nowait(message)
     except websockets.exceptions.ConnectionClosed:
         print(f"--- Client {remote_addr} disconnected ---")
     except Exception as e:
         print(f"Error handling client: {e}")
+    finally:
+        await queue.join()
+        printer.cancel()
 
 async def start_server():
     print(f"Starting WebSocket SERVER on ws://{ADDR}:{PORT}...")
@@ -34,6 +74,10 @@ async def start_server():
             print("TIP: Blendmate application is probably already running on this port.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blendmate WS Spy")
+    parser.add_argument("--pretty", action="store_true", help="indent received JSON")
+    PRETTY = parser.parse_args().pretty
+
     print("=== Blendmate WS Spy (Server Mode) ===")
     try:
         asyncio.run(start_server())